@@ -17,18 +17,33 @@ import time
 import asyncio
 import random
 import logging
+from itertools import product
 from datetime import datetime
 from typing import List, Set, Optional
 from urllib.parse import quote_plus
-from httpx import AsyncClient, RequestError
+from httpx import AsyncClient, Limits, RequestError
+
+try:
+    import orjson as _orjson  # C tabanlı JSON; yoksa stdlib'e düşeriz
+except ImportError:
+    _orjson = None
 
 # ---------------- CONFIG ----------------
 CACHE_FILE = "cache.json"
+NEG_CACHE_FILE = "negative.json"  # negatif cache ayrı dosyada; sıcak cache.json küçük kalsın
+CANDIDATES_FILE = "candidates_cache.json"  # büyük candidate listesi; run başına bir kez yazılır
 CACHE_TTL_SECONDS = 12 * 60 * 60  # 12 saat default
+NEG_TTL_SECONDS = 6 * 60 * 60  # başarısız hostlar bu süre boyunca tekrar denenmez
+NEG_MAX_ENTRIES = 50000
 CONCURRENCY = 30
 REQUEST_TIMEOUT = 8.0
+SOURCE_TIMEOUT = 15  # tek bir pasif kaynağın tüm discovery'yi bekletmesini önler
 PLAYWRIGHT_ENABLED = True  # Eğer ortamda playwright kuruluysa True bırak
 BRUTE_FORCE_ONLY_IF_EMPTY = True
+MIN_CT_CANDIDATES = 5  # pasif kaynaklar bundan az host verdiyse bruteforce devreye girer
+# İçerik imzası (EXTM3U / mpegurl) olmayan düz 200 yanıtlarını da kabul et.
+# Parking page'leri de geçirebilir; False yapmak doğrulamayı sıkılaştırır.
+ACCEPT_BARE_200 = True
 MANUAL_DOMAINS_FILE = "domains.txt"
 LOG_FILE = "dengetv_auto.log"
 
@@ -38,6 +53,38 @@ DENGETV_MAX_PAGES = 40
 
 COMMON_SUBS = ["cdn", "media", "stream", "live", "player", "video", "kodiaq", "tible", "kodi", "srv"]
 TLDs = ["sbs", "xyz", "fun", "cam", "live"]
+_TLD_SET = frozenset(TLDs)
+# discover_by_path aday genişletmesinin sabitleri; her çağrıda liste kurulmasın
+_BASE_PATTERNS = ("zirvedesin", "zirve", "zdesin", "kodiaq", "tible", "stream", "live", "cdn", "media", "player")
+_PATH_SUBS = ("www", "cdn", "media", "stream", "live", "player", "video", "srv", "srv1", "srv2")
+
+# Bruteforce seti yalnızca yukarıdaki sabitlere bağlı; import'ta bir kez
+# kurulur, her çağrıda ~9k string yeniden üretilmez.
+_BRUTE_CANDIDATES = frozenset(
+    f"{sub}.zirvedesin{n}.{tld}"
+    for sub, tld, n in product(COMMON_SUBS, _TLD_SET, range(10, 120))
+)
+
+# discover_by_path'in pattern genişletmesi de sabit ama ~130k eleman;
+# import'u yavaşlatmamak için ilk kullanımda bir kez kurulup saklanır.
+_PATH_CANDIDATES: Optional[frozenset] = None
+
+def _pattern_candidates() -> frozenset:
+    global _PATH_CANDIDATES
+    if _PATH_CANDIDATES is None:
+        c = set()
+        c.update(
+            f"{base}{n}.{t}"
+            for base, t, n in product(_BASE_PATTERNS, _TLD_SET, range(1, 120))
+        )
+        c.update(
+            f"{sub}.{base}{n}.{t}"
+            for sub, base, t, n in product(_PATH_SUBS, _BASE_PATTERNS, _TLD_SET, range(1, 120))
+        )
+        c.update(f"{base}.sbs" for base in _BASE_PATTERNS)
+        c.update(f"{sub}.{base}.sbs" for sub, base in product(_PATH_SUBS, _BASE_PATTERNS))
+        _PATH_CANDIDATES = frozenset(c)
+    return _PATH_CANDIDATES
 
 # ----------------------------------------
 
@@ -53,6 +100,10 @@ formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
 console.setFormatter(formatter)
 logging.getLogger().addHandler(console)
 
+# Hot path'teki log satırları türetilmiş argümanlarını (scheme, url vb.)
+# INFO kapalıyken boşuna hesaplamasın diye seviye bir kez okunur.
+_LOG_INFO = logging.getLogger().isEnabledFor(logging.INFO)
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116 Safari/537.36",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116 Safari/537.36",
@@ -60,23 +111,125 @@ USER_AGENTS = [
 ]
 
 # ---------------- helpers ----------------
+_CLEAN_RE = re.compile(r"^\*\.")  # wildcard önekini tek regex geçişinde temizle
+
+def _normalize_host(c: str) -> str:
+    """Aday host normalizasyonu: boşluk/wildcard öneki temizle, küçült.
+
+    Yüz binlerce aday üzerinde dönen saf-Python sıcak nokta; gerektiğinde
+    mypyc/Cython ile derlenebilsin diye tek tipli fonksiyonda tutulur.
+    """
+    return _CLEAN_RE.sub("", c.strip()).lower()
+
+# Scraping döngülerinde her iterasyonda re.findall çağrısı pattern cache
+# lookup'ı + flag parse maliyeti ödüyordu; hot regex'ler burada bir kez
+# derlenir. Bytes pattern'lar r.content üzerinde çalışarak UTF-8 decode'u
+# da atlar.
+_HOST_RE = re.compile(rb'([a-z0-9\-_\.]+zirvedesin[0-9]*\.[a-z]{2,6})', re.I)
+_URL_RE = re.compile(rb'https?://[a-z0-9\-_\.]+zirvedesin[0-9]*\.[a-z]{2,6}[:/][^\s"\']*', re.I)
+_SCHEME_RE = re.compile(rb'^https?://')
+_CHAN_NUM_RE = re.compile(r'(\d+)')
+# m3u content-type imzaları ("mpegurl" hem application/vnd.apple.mpegurl
+# hem audio/mpegurl varyantını kapsar)
+_M3U_CT = ("mpegurl", ".m3u8")
+# M3U çıktısındaki kanal bloğu şablonu; satır satır append yerine tek join
+_CHANNEL_TPL = (
+    '#EXTINF:-1 group-title="Dengetv54",{name}\n'
+    '#EXTVLCOPT:http-user-agent=Mozilla/5.0\n'
+    '#EXTVLCOPT:http-referrer={ref}\n'
+    '{base}{file}'
+)
+def _json_loads(raw: bytes):
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+def _json_dumps(data) -> bytes:
+    if _orjson is not None:
+        return _orjson.dumps(data, option=_orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+# run içi tekrar okumalar disk'e inmesin; mtime değişmediyse bellekteki kopya döner
+_CACHE_MEM = {"mtime": None, "data": None}
+
 def _load_cache() -> dict:
     if not os.path.exists(CACHE_FILE):
         return {}
     try:
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f) or {}
+        mtime = os.path.getmtime(CACHE_FILE)
+        if _CACHE_MEM["mtime"] == mtime and _CACHE_MEM["data"] is not None:
+            return _CACHE_MEM["data"]
+        with open(CACHE_FILE, "rb") as f:
+            data = _json_loads(f.read()) or {}
+        _CACHE_MEM.update(mtime=mtime, data=data)
+        return data
     except Exception as e:
         logging.warning("Cache yüklenemedi: %s", e)
         return {}
 
 def _save_cache(data: dict):
+    tmp = CACHE_FILE + ".tmp"
     try:
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(tmp, "wb") as f:
+            f.write(_json_dumps(data))
+        os.replace(tmp, CACHE_FILE)  # atomik; crash yarım dosya bırakamaz
+        _CACHE_MEM.update(mtime=os.path.getmtime(CACHE_FILE), data=data)
     except Exception as e:
         logging.error("Cache kaydedilemedi: %s", e)
 
+def _load_negative() -> dict:
+    """Negatif cache'i yükle; süresi dolanları ele, boyutu sınırla."""
+    if not os.path.exists(NEG_CACHE_FILE):
+        return {}
+    try:
+        with open(NEG_CACHE_FILE, "rb") as f:
+            neg = _json_loads(f.read()) or {}
+    except Exception as e:
+        logging.warning("Negatif cache yüklenemedi: %s", e)
+        return {}
+    if not isinstance(neg, dict):
+        return {}
+    now = time.time()
+    neg = {h: ts for h, ts in neg.items() if now - ts < NEG_TTL_SECONDS}
+    if len(neg) > NEG_MAX_ENTRIES:
+        neg = dict(sorted(neg.items(), key=lambda kv: kv[1])[-NEG_MAX_ENTRIES:])
+    return neg
+
+def _save_negative(neg: dict):
+    tmp = NEG_CACHE_FILE + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(_json_dumps(neg))
+        os.replace(tmp, NEG_CACHE_FILE)
+    except Exception as e:
+        logging.error("Negatif cache kaydedilemedi: %s", e)
+
+def _save_candidates(candidates: List[str]):
+    """Candidate listesini atomik yaz; yarım dosya cache'i bozmasın."""
+    tmp = CANDIDATES_FILE + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            # Dosyada sıralı tutmak diff/incelemeyi kolaylaştırır; çalışma
+            # listesinin kendisi sıralanmaz.
+            f.write(_json_dumps(sorted(candidates)))
+        os.replace(tmp, CANDIDATES_FILE)
+    except Exception as e:
+        logging.error("Candidate cache kaydedilemedi: %s", e)
+
+def _bloom_or_set():
+    """Aday toplama için üyelik yapısı.
+
+    pybloom_live kuruluysa ölçeklenebilir Bloom filter (çok büyük CT-log /
+    bruteforce setlerinde düşük bellek), yoksa düz set. Kesin dedupe zaten
+    normalizasyon aşamasında yapılıyor; burada yanlış-pozitif oranı ihmal
+    edilebilir.
+    """
+    try:
+        from pybloom_live import ScalableBloomFilter
+        return ScalableBloomFilter(initial_capacity=10000, error_rate=0.001)
+    except Exception:
+        return set()
+
 def load_manual_domains() -> List[str]:
     if not os.path.exists(MANUAL_DOMAINS_FILE):
         return []
@@ -89,58 +242,204 @@ def load_manual_domains() -> List[str]:
 
 async def _get_with_retries(client: AsyncClient, url: str, attempts: int = 2, timeout: float = REQUEST_TIMEOUT):
     backoff = 0.6
+    r = None
     for i in range(attempts):
         try:
-            r = await client.get(url, timeout=timeout, headers={"User-Agent": random.choice(USER_AGENTS)})
-            return r
+            # UA client kurulurken bir kez seçildi; istek başına dict kurulmaz
+            r = await client.get(url, timeout=timeout)
         except Exception as e:
             logging.debug("GET hata (%s) %s -> %s", i, url, e)
-            await asyncio.sleep(backoff)
-            backoff *= 1.9
-    return None
+            r = None
+        # Sadece ağ hatası, 5xx ve 429 retry edilir; kalıcı 4xx'e tekrar
+        # vurmanın anlamı yok.
+        if r is not None and r.status_code != 429 and r.status_code < 500:
+            return r
+        if i == attempts - 1:
+            break  # deneme hakkı bitti; kimse retry etmeyecek, boşuna bekleme
+        # Jitter: crt.sh gibi paylaşılan kaynaklara tüm task'ların aynı anda
+        # (lockstep) tekrar vurmasını engeller.
+        delay = backoff * (0.5 + random.random())
+        if r is not None and r.status_code == 429:
+            retry_after = r.headers.get("Retry-After")
+            try:
+                delay = min(float(retry_after), 30.0)
+            except (TypeError, ValueError):
+                pass
+        await asyncio.sleep(delay)
+        backoff = min(backoff * 1.9, 8.0)
+    return r
 
 # ---------------- AutoDiscovery ----------------
+class _StopDiscovery(Exception):
+    """İlk başarılı sonuç bulununca TaskGroup'u durdurmak için iç sinyal."""
+
+
+class _AdmissionController:
+    """asyncio.Condition tabanlı dinamik eşzamanlılık sınırı.
+
+    Sabit Semaphore'un aksine limit çalışırken ayarlanabilir: arka arkaya
+    429 yanıtlarında limit yarıya iner (upstream'in rate-limit'ini
+    yatıştırır), yanıt alınan her probe'da bir artarak üst sınıra geri
+    tırmanır. Ölü adayların bağlantı hataları baskı SAYILMAZ — TCP reddeden
+    bir aday bizi rate-limit'lemiyordur ve bu iş yükü tasarım gereği
+    çoğunlukla ölü hostlardan oluşur. `async with` ile Semaphore gibi
+    kullanılır.
+    """
+
+    def __init__(self, limit: int, min_limit: int = 4):
+        self._cond = asyncio.Condition()
+        self._active = 0
+        self._limit = limit
+        self._max = limit
+        self._min = min_limit
+        self._consec_errors = 0
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._limit)
+            self._active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+        return False
+
+    async def record_success(self):
+        async with self._cond:
+            self._consec_errors = 0
+            if self._limit < self._max:
+                self._limit += 1
+                self._cond.notify(1)
+
+    async def record_error(self):
+        async with self._cond:
+            self._consec_errors += 1
+            if self._consec_errors >= 3 and self._limit > self._min:
+                self._limit = max(self._min, self._limit // 2)
+                self._consec_errors = 0
+                logging.info("Eşzamanlılık limiti düşürüldü: %d", self._limit)
+
+
 class AutoDiscovery:
     def __init__(self):
-        self.semaphore = asyncio.Semaphore(CONCURRENCY)
+        self.semaphore = _AdmissionController(CONCURRENCY)
+        self._client: Optional[AsyncClient] = None
+        self.negative = {}  # host -> son başarısız probe zamanı
+        self._pw = None
+        self._browser = None
+
+    def _get_client(self) -> AsyncClient:
+        """Tüm probe'lar için paylaşılan, connection-pool'lu client.
+
+        Her HEAD/GET için yeni client açmak her seferinde TCP+TLS handshake
+        demek; tek client ile keep-alive/H2 multiplexing kullanılır.
+        """
+        if self._client is None or self._client.is_closed:
+            # trust_env=False: binlerce kısa probe'da env/proxy taraması yapma.
+            # UA client seviyesinde bir kez seçilir; istek başına dict kurulmaz.
+            opts = dict(
+                timeout=REQUEST_TIMEOUT,
+                limits=Limits(max_connections=200, max_keepalive_connections=100),
+                follow_redirects=True,
+                trust_env=False,
+                headers={"User-Agent": random.choice(USER_AGENTS)},
+            )
+            try:
+                self._client = AsyncClient(http2=True, **opts)
+            except ImportError:
+                # h2 paketi kurulu değilse HTTP/1.1 ile devam et
+                self._client = AsyncClient(**opts)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception:
+                pass
+            self._pw = None
+
+    async def _get_browser(self):
+        """Playwright browser'ını süreç boyunca sıcak tut.
+
+        Her çağrıda launch etmek ~300ms cold-start demek; browser bir kez
+        açılır, aclose() kapatır.
+        """
+        if self._browser is None:
+            from playwright.async_api import async_playwright
+            self._pw = await async_playwright().start()
+            self._browser = await self._pw.chromium.launch(headless=True, args=["--no-sandbox"])
+        return self._browser
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+        return False
 
     # ----- passive sources -----
     async def query_crtsh(self, pattern="zirvedesin") -> Set[str]:
-        q = quote_plus(f"%{pattern}%")
-        url = f"https://crt.sh/?q={q}&output=json"
         found = set()
-        async with AsyncClient(timeout=20) as client:
-            r = await _get_with_retries(client, url, attempts=2)
-            if not r or r.status_code != 200:
-                logging.info("crt.sh boş veya erişilemedi.")
-                return set()
+        # Sunucu taraflı substring sorgusu: domain ailesi numaralı
+        # (zirvedesinNN.tld / sub.zirvedesinNN.tld) olduğu için suffix
+        # wildcard'ları (%.zirvedesin.sbs gibi) hiçbir kayda denk gelmez;
+        # %pattern% ile CT loglarında sertifika almış tüm hostlar tek
+        # istekte gelir ve bruteforce'u çoğunlukla gereksiz kılar.
+        queries = (f"%{pattern}%",)
+        client = self._get_client()
+        # Birden fazla sorgu olursa SOURCE_TIMEOUT bütçesini sırayla
+        # paylaşamazlar; hepsi aynı anda gönderilir.
+        responses = await asyncio.gather(
+            *(
+                _get_with_retries(client, f"https://crt.sh/?q={quote_plus(q)}&output=json", attempts=2, timeout=20)
+                for q in queries
+            ),
+            return_exceptions=True,
+        )
+        for q, r in zip(queries, responses):
+            if isinstance(r, BaseException) or not r or r.status_code != 200:
+                logging.info("crt.sh boş veya erişilemedi (%s).", q)
+                continue
             try:
-                entries = r.json()
+                # Wildcard sorguları on binlerce kayıt dönebilir; parse'ı
+                # thread'e taşı ki event loop probe'lara açık kalsın.
+                entries = await asyncio.to_thread(_json_loads, r.content)
             except Exception as e:
                 logging.info("crt.sh JSON parse hatası: %s", e)
-                return set()
-        for e in entries if isinstance(entries, list) else []:
-            nv = e.get("name_value", "")
-            for line in str(nv).splitlines():
-                candidate = line.strip().lstrip("*.")
-                if "zirvedesin" in candidate and any(candidate.endswith("." + t) for t in TLDs + ["sbs"]):
-                    found.add(candidate)
+                continue
+            for e in entries if isinstance(entries, list) else []:
+                nv = e.get("name_value", "")
+                for line in str(nv).splitlines():
+                    candidate = line.strip().lstrip("*.")
+                    if pattern in candidate and any(candidate.endswith("." + t) for t in TLDs + ["sbs"]):
+                        found.add(candidate)
         logging.info("crt.sh ile bulunan: %d", len(found))
         return found
 
     async def query_certspotter(self, domain="zirvedesin.sbs") -> Set[str]:
         url = f"https://api.certspotter.com/v1/issuances?domain={domain}&include_subdomains=true&expand=dns_names"
         found = set()
-        async with AsyncClient(timeout=20) as client:
-            r = await _get_with_retries(client, url, attempts=2)
-            if not r or r.status_code != 200:
-                logging.info("certspotter boş veya erişilemedi.")
-                return set()
-            try:
-                data = r.json()
-            except Exception as e:
-                logging.info("certspotter JSON parse hatası: %s", e)
-                return set()
+        client = self._get_client()
+        r = await _get_with_retries(client, url, attempts=2, timeout=20)
+        if not r or r.status_code != 200:
+            logging.info("certspotter boş veya erişilemedi.")
+            return set()
+        try:
+            data = await asyncio.to_thread(_json_loads, r.content)
+        except Exception as e:
+            logging.info("certspotter JSON parse hatası: %s", e)
+            return set()
         for e in data if isinstance(data, list) else []:
             for name in e.get("dns_names", []):
                 candidate = str(name).lstrip("*.")
@@ -152,82 +451,126 @@ class AutoDiscovery:
     async def query_rapiddns_search(self, q="zirvedesin") -> Set[str]:
         url = f"https://rapiddns.io/search?search={quote_plus(q)}&full=1"
         found = set()
-        async with AsyncClient(timeout=15) as client:
-            r = await _get_with_retries(client, url, attempts=2, timeout=15)
-            if not r or r.status_code != 200:
-                logging.info("rapiddns boş veya erişilemedi.")
-                return set()
-            text = r.text or ""
-        for m in re.findall(r'([a-z0-9\-\_\.]+zirvedesin[0-9]*\.[a-z]{2,6})', text, flags=re.I):
-            found.add(m.lstrip("*."))
+        client = self._get_client()
+        r = await _get_with_retries(client, url, attempts=2, timeout=15)
+        if not r or r.status_code != 200:
+            logging.info("rapiddns boş veya erişilemedi.")
+            return set()
+        body = r.content or b""
+        for m in _HOST_RE.findall(body):
+            found.add(m.decode("ascii", "ignore").lstrip("*."))
         logging.info("rapiddns ile bulunan: %d", len(found))
         return found
 
     async def extract_from_dengetv_pages(self, start=DENGETV_START, end=DENGETV_END, max_pages=DENGETV_MAX_PAGES) -> Set[str]:
         found = set()
-        async with AsyncClient(timeout=10) as client:
-            count = 0
-            for i in range(start, end+1):
-                url = f"https://dengetv{i}.live/"
-                try:
-                    r = await _get_with_retries(client, url, attempts=1, timeout=8)
-                    if not r or r.status_code != 200:
-                        continue
-                    text = r.text or ""
-                    for match in re.findall(r'([a-z0-9\-\_\.]+zirvedesin[0-9]*\.[a-z]{2,6})', text, flags=re.IGNORECASE):
-                        found.add(match.lstrip("*."))
-                    for match in re.findall(r'https?://[a-z0-9\-\_\.]+zirvedesin[0-9]*\.[a-z]{2,6}[:/][^\s"\']*', text, flags=re.IGNORECASE):
-                        host = re.sub(r'^https?://', '', match).split('/')[0].lstrip("*.")
-                        found.add(host)
-                    count += 1
-                    if count >= max_pages:
-                        break
-                except Exception:
-                    continue
+        client = self._get_client()
+
+        async def _fetch(i):
+            async with self.semaphore:
+                return await _get_with_retries(client, f"https://dengetv{i}.live/", attempts=1, timeout=8)
+
+        # 134 sayfayı sırayla beklemek yerine semaphore sınırında fan-out
+        results = await asyncio.gather(*(_fetch(i) for i in range(start, end+1)), return_exceptions=True)
+        count = 0
+        for r in results:
+            if isinstance(r, BaseException) or not r or r.status_code != 200:
+                continue
+            body = r.content or b""
+            for match in _HOST_RE.findall(body):
+                found.add(match.decode("ascii", "ignore").lstrip("*."))
+            for match in _URL_RE.findall(body):
+                host = _SCHEME_RE.sub(b"", match).split(b"/")[0].lstrip(b"*.")
+                found.add(host.decode("ascii", "ignore"))
+            count += 1
+            if count >= max_pages:
+                break
 
-        # Playwright fallback
-        if PLAYWRIGHT_ENABLED:
+        # Playwright fallback: headless tarayıcı sayfa başına saniyeler tutar,
+        # HTTP taraması bir şey bulduysa hiç açılmaz; boş döndüyse de en fazla
+        # 10 sayfa denenir.
+        if not found and PLAYWRIGHT_ENABLED:
             try:
-                from playwright.async_api import async_playwright
-                async with async_playwright() as p:
-                    browser = await p.chromium.launch(headless=True, args=["--no-sandbox"])
-                    page = await browser.new_page()
-                    count = 0
-                    for i in range(start, end+1):
-                        url = f"https://dengetv{i}.live/"
+                browser = await self._get_browser()
+                pw_sem = asyncio.Semaphore(8)
+
+                async def _scrape(i):
+                    # Tek uzun ömürlü page yerine task başına kısa ömürlü page:
+                    # listener/DOM sızıntısı birikmez, 8'li paralellik sağlanır.
+                    async with pw_sem:
+                        page = await browser.new_page()
                         try:
-                            await page.goto(url, timeout=15000)
-                            content = await page.content()
-                            for m in re.findall(r'https?://[a-z0-9\-\_\.]+zirvedesin[0-9]*\.[a-z]{2,6}[:/][^\s"\']*', content, flags=re.I):
-                                host = re.sub(r'^https?://', '', m).split('/')[0].lstrip("*.")
-                                found.add(host)
-                            count += 1
-                            if count >= max_pages:
-                                break
+                            await page.goto(f"https://dengetv{i}.live/", timeout=15000)
+                            return (await page.content()).encode("utf-8", "ignore")
                         except Exception:
-                            continue
-                    await browser.close()
+                            return b""
+                        finally:
+                            await page.close()
+
+                last = min(end, start + min(max_pages, 10) - 1)
+                contents = await asyncio.gather(*(_scrape(i) for i in range(start, last + 1)), return_exceptions=True)
+                for content in contents:
+                    if isinstance(content, BaseException) or not content:
+                        continue
+                    for m in _URL_RE.findall(content):
+                        host = _SCHEME_RE.sub(b"", m).split(b"/")[0].lstrip(b"*.")
+                        found.add(host.decode("ascii", "ignore"))
             except Exception as e:
                 logging.info("Playwright çalıştırılamadı veya hata: %s", e)
 
         logging.info("dengetv sayfalarından bulunan: %d", len(found))
         return found
 
-    def generate_bruteforce_candidates(self) -> Set[str]:
-        found = set()
-        for sub in COMMON_SUBS:
-            for tld in TLDs:
-                for n in range(10, 120):
-                    found.add(f"{sub}.zirvedesin{n}.{tld}")
-                    found.add(f"{sub}.zirvedesin{n}.sbs")
-        logging.info("bruteforce candidate sayısı: %d", len(found))
-        return found
+    def generate_bruteforce_candidates(self) -> frozenset:
+        logging.info("bruteforce candidate sayısı: %d", len(_BRUTE_CANDIDATES))
+        return _BRUTE_CANDIDATES
+
+    # ----- DNS ön filtresi -----
+    async def prefilter_resolvable(self, hosts: List[str]) -> List[str]:
+        """HTTP'den önce tüm candidate'ları tek geçişte DNS ile ele.
+
+        Bruteforce setinin büyük kısmı NXDOMAIN; DNS hatası ~5-20ms (UDP)
+        iken TLS handshake 100-300ms tutar, o yüzden çözülmeyen hostları
+        burada elemek probe fazını ciddi kısaltır. aiodns kurulu değilse
+        event loop'un getaddrinfo'suna düşülür.
+        """
+        sem = asyncio.Semaphore(200)  # saf DNS; HTTP limitinden çok daha geniş olabilir
+        try:
+            import socket
+            import aiodns
+            resolver = aiodns.DNSResolver()
+
+            async def _resolve(h):
+                async with sem:
+                    try:
+                        await resolver.gethostbyname(h, socket.AF_INET)
+                        return h
+                    except Exception:
+                        return None
+        except Exception as e:
+            logging.info("aiodns kullanılamadı, getaddrinfo fallback: %s", e)
+            loop = asyncio.get_running_loop()
+
+            async def _resolve(h):
+                async with sem:
+                    try:
+                        await loop.getaddrinfo(h, 443)
+                        return h
+                    except Exception:
+                        return None
+
+        results = await asyncio.gather(*(_resolve(h) for h in hosts), return_exceptions=True)
+        resolved = [h for h in results if isinstance(h, str)]
+        logging.info("DNS ön filtresi: %d/%d host çözüldü", len(resolved), len(hosts))
+        return resolved
 
     # ----- improved validate_host -----
     async def validate_host(self, client: AsyncClient, host: str, paths: list = None) -> Optional[str]:
         if not host:
             return None
         host = host.strip().lstrip("*.")
+        if self.negative.get(host, 0) + NEG_TTL_SECONDS > time.time():
+            return None
         if paths is None:
             sample_files = [
                 "/yayinzirve.m3u8",
@@ -242,196 +585,360 @@ class AutoDiscovery:
             paths = sample_files
 
         schemes = ["https://", "http://"]
-        for scheme in schemes:
-            for p in paths:
-                url = f"{scheme}{host}{p}"
-                try:
-                    r = await client.head(url, timeout=REQUEST_TIMEOUT, headers={"User-Agent": random.choice(USER_AGENTS)}, follow_redirects=True)
-                except Exception:
-                    r = None
-                if not r or r.status_code not in (200, 206, 301, 302):
-                    try:
-                        r = await client.get(url, timeout=REQUEST_TIMEOUT, headers={"User-Agent": random.choice(USER_AGENTS)}, follow_redirects=True)
-                    except Exception:
-                        r = None
-                if r and r.status_code in (200, 206):
-                    text = ""
+        # Tüm scheme×path kombinasyonlarını aynı anda yokla; ilk başarı yeter.
+        tasks = [
+            asyncio.create_task(self._probe(client, scheme, host, p))
+            for scheme in schemes for p in paths
+        ]
+        result = None
+        pending = set(tasks)
+        try:
+            while pending and result is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
                     try:
-                        ct = r.headers.get("content-type", "")
-                        if "application/vnd.apple.mpegurl" in ct or "audio/mpegurl" in ct or ".m3u8" in ct or r.text:
-                            text = (r.text or "")[:4000]
+                        res = t.result()
                     except Exception:
-                        text = ""
-                    if text and ("EXTM3U" in text or ".m3u8" in text or "#EXTINF" in text):
-                        logging.info("Doğrulandı: %s via %s (path=%s)", host, scheme.rstrip('://'), p)
-                        return f"{scheme}{host}/"
-                    if r.request and r.status_code == 200:
-                        logging.info("Doğrulandı (200): %s via %s (path=%s) - content-type: %s", host, scheme.rstrip('://'), p, r.headers.get("content-type"))
-                        return f"{scheme}{host}/"
+                        continue
+                    if res:
+                        result = res
+                        break
+        finally:
+            for t in pending:
+                t.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        if result is None:
+            # tüm scheme×path kombinasyonları başarısız -> negatif cache'e yaz
+            self.negative[host] = time.time()
+        else:
+            self.negative.pop(host, None)
+        return result
+
+    async def _probe(self, client: AsyncClient, scheme: str, host: str, p: str) -> Optional[str]:
+        url = f"{scheme}{host}{p}"
+        try:
+            r = await client.head(url, timeout=REQUEST_TIMEOUT, follow_redirects=True)
+        except Exception:
+            r = None
+        # Controller gözlenen trafiği buradan görür: 429 baskı sinyali,
+        # herhangi bir başka yanıt limiti üst sınıra doğru geri tırmandırır.
+        # Bağlantı hatası sinyal değildir; ölü adaylar normaldir.
+        if r is not None:
+            if r.status_code == 429:
+                await self.semaphore.record_error()
+            else:
+                await self.semaphore.record_success()
+        if r is not None and r.status_code in (200, 206, 301, 302):
+            ct = (r.headers.get("content-type", "") or "").lower()
+            if r.status_code in (200, 206) and any(t in ct for t in _M3U_CT):
+                # HEAD + doğru content-type kesin sonuç; GET'e gerek yok.
+                if _LOG_INFO:
+                    logging.info("Doğrulandı (HEAD): %s via %s (path=%s)", host, scheme[:-3], p)
+                return f"{scheme}{host}/"
+            # HEAD gövde taşımaz; 200 geldiyse host büyük ihtimalle canlı.
+            if ACCEPT_BARE_200 and r.status_code == 200:
+                if _LOG_INFO:
+                    logging.info("Doğrulandı (200): %s via %s (path=%s) - content-type: %s", host, scheme[:-3], p, ct)
+                return f"{scheme}{host}/"
+            return None
+
+        # HEAD sonuç vermedi -> GET; ama tüm gövdeyi indirmek yerine
+        # ilk 4 KiB'ı akıştan okuyup byte seviyesinde imza ara.
+        buf = b""
+        status = None
+        ct = ""
+        try:
+            async with client.stream("GET", url, timeout=REQUEST_TIMEOUT, follow_redirects=True) as resp:
+                status = resp.status_code
+                ct = resp.headers.get("content-type", "")
+                if status in (200, 206):
+                    async for chunk in resp.aiter_raw():
+                        buf += chunk
+                        if len(buf) >= 4096:
+                            break
+        except Exception:
+            return None
+        if r is None:
+            if status == 429:
+                await self.semaphore.record_error()
+            else:
+                await self.semaphore.record_success()
+        if status in (200, 206):
+            if b"EXTM3U" in buf or b".m3u8" in buf or b"#EXTINF" in buf:
+                if _LOG_INFO:
+                    logging.info("Doğrulandı: %s via %s (path=%s)", host, scheme[:-3], p)
+                return f"{scheme}{host}/"
+            if ACCEPT_BARE_200 and status == 200:
+                if _LOG_INFO:
+                    logging.info("Doğrulandı (200): %s via %s (path=%s) - content-type: %s", host, scheme[:-3], p, ct)
+                return f"{scheme}{host}/"
         return None
 
     # ----- path-temelli discovery -----
     async def discover_by_path(self, path: str = "/yayinzirve.m3u8", max_candidates: int = 2000) -> Optional[str]:
         logging.info("Path-temelli discovery başlıyor: %s", path)
 
+        if not self.negative:
+            self.negative = _load_negative()
+
         seeds = set(load_manual_domains())
-        try:
-            seeds.update(await self.query_crtsh("zirvedesin"))
-        except Exception as e:
-            logging.debug("crtsh seed hatası: %s", e)
-        try:
-            seeds.update(await self.query_certspotter("zirvedesin.sbs"))
-        except Exception as e:
-            logging.debug("certspotter seed hatası: %s", e)
-        try:
-            seeds.update(await self.extract_from_dengetv_pages())
-        except Exception as e:
-            logging.debug("dengetv seed hatası: %s", e)
-
-        base_patterns = ["zirvedesin", "zirve", "zdesin", "kodiaq", "tible", "stream", "live", "cdn", "media", "player"]
-        tlds = ["sbs", "xyz", "fun", "cam", "live"]
-        subs = ["www", "cdn", "media", "stream", "live", "player", "video", "srv", "srv1", "srv2"]
-
-        candidates = set()
-        for s in seeds:
-            candidates.add(s.strip().lstrip("*."))
-        for base in base_patterns:
-            for t in tlds:
-                for n in range(1, 120):
-                    candidates.add(f"{base}{n}.{t}")
-                    for sub in subs:
-                        candidates.add(f"{sub}.{base}{n}.{t}")
-            candidates.add(f"{base}.sbs")
-            for sub in subs:
-                candidates.add(f"{sub}.{base}.sbs")
+        # Seed kaynakları birbirinden bağımsız; sırayla beklemek yerine
+        # hepsi aynı anda (discover_base'deki desenle) sorgulanır.
+        seed_results = await asyncio.gather(
+            asyncio.wait_for(self.query_crtsh("zirvedesin"), timeout=SOURCE_TIMEOUT),
+            asyncio.wait_for(self.query_certspotter("zirvedesin.sbs"), timeout=SOURCE_TIMEOUT),
+            asyncio.wait_for(self.extract_from_dengetv_pages(), timeout=SOURCE_TIMEOUT * 4),
+            return_exceptions=True,
+        )
+        for name, res in zip(("crtsh", "certspotter", "dengetv"), seed_results):
+            if isinstance(res, BaseException):
+                logging.debug("%s seed hatası: %s", name, res)
+            else:
+                seeds.update(res)
 
-        candidates = list(candidates)
-        random.shuffle(candidates)
-        if len(candidates) > max_candidates:
-            candidates = candidates[:max_candidates]
+        candidates = {_normalize_host(s) for s in seeds if s}
+        candidates.update(_pattern_candidates())
+
+        # Son NEG_TTL_SECONDS içinde ölü çıkanları tekrar deneme. Çıplak
+        # host anahtarı validate_host'un "tüm scheme×path'ler öldü" kaydı;
+        # buradaki tek-path başarısızlıkları "host|path" anahtarıyla ayrı
+        # tutulur ki aynı koşudaki tam doğrulamayı kısa devre etmesin.
+        now = time.time()
+        candidates = {
+            c for c in candidates
+            if self.negative.get(c, 0) + NEG_TTL_SECONDS <= now
+            and self.negative.get(f"{c}|{path}", 0) + NEG_TTL_SECONDS <= now
+        }
+
+        # 130k elemanı karıştırıp 2k'sını almak yerine doğrudan k örnek çek
+        candidates = random.sample(list(candidates), min(max_candidates, len(candidates)))
+        # çözülmeyen hostlar HTTP fazına hiç girmesin
+        candidates = await self.prefilter_resolvable(candidates)
 
         logging.info("discover_by_path: test edilecek candidate sayısı: %d", len(candidates))
 
+        client = self._get_client()
+
         async def _check_host(host):
-            async with self.semaphore:
-                async with AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-                    for scheme in ("https://", "http://"):
-                        url = f"{scheme}{host}{path}"
-                        try:
-                            r = await client.head(url, timeout=REQUEST_TIMEOUT, headers={"User-Agent": random.choice(USER_AGENTS)}, follow_redirects=True)
-                        except Exception:
-                            r = None
-                        if not r or r.status_code not in (200, 206):
-                            try:
-                                r = await client.get(url, timeout=REQUEST_TIMEOUT, headers={"User-Agent": random.choice(USER_AGENTS)}, follow_redirects=True)
-                            except Exception:
-                                r = None
-                        if r and r.status_code in (200, 206):
-                            ct = r.headers.get("content-type", "") or ""
-                            body = ""
-                            try:
-                                body = (r.text or "")[:2000]
-                            except Exception:
-                                body = ""
-                            if ("mpegurl" in ct) or (".m3u8" in ct) or ("EXTM3U" in body) or (".m3u8" in body):
-                                logging.info("Path bulundu: %s (via %s)", f"{scheme}{host}/", url)
-                                return f"{scheme}{host}/"
-                            if r.status_code == 200:
-                                logging.info("200 geldi, path muhtemelen var: %s (via %s) ct=%s", f"{scheme}{host}/", url, ct)
-                                return f"{scheme}{host}/"
+            for scheme in ("https://", "http://"):
+                url = f"{scheme}{host}{path}"
+                try:
+                    r = await client.head(url, timeout=REQUEST_TIMEOUT, follow_redirects=True)
+                except Exception:
+                    r = None
+                if r is not None:
+                    if r.status_code == 429:
+                        await self.semaphore.record_error()
+                    else:
+                        await self.semaphore.record_success()
+                if r is not None and r.status_code in (200, 206):
+                    # HEAD gövdesiz; content-type veya 200 durumu yeterli sinyal
+                    ct = (r.headers.get("content-type", "") or "").lower()
+                    if any(t in ct for t in _M3U_CT) or (ACCEPT_BARE_200 and r.status_code == 200):
+                        if _LOG_INFO:
+                            logging.info("Path bulundu: %s (via %s)", f"{scheme}{host}/", url)
+                        return f"{scheme}{host}/"
+                    continue
+                # HEAD sonuçsuz -> streaming GET; gövdenin ilk 4 KiB'ı yeter,
+                # kötü konfigüre edilmiş hostların dev HTML'i inmesin.
+                buf = b""
+                status = None
+                ct = ""
+                try:
+                    async with client.stream("GET", url, timeout=REQUEST_TIMEOUT, follow_redirects=True) as resp:
+                        status = resp.status_code
+                        ct = (resp.headers.get("content-type", "") or "").lower()
+                        if status in (200, 206):
+                            async for piece in resp.aiter_bytes(4096):
+                                buf += piece
+                                if len(buf) >= 4096:
+                                    break
+                except Exception:
+                    continue
+                if r is None:
+                    if status == 429:
+                        await self.semaphore.record_error()
+                    else:
+                        await self.semaphore.record_success()
+                if status in (200, 206):
+                    if any(t in ct for t in _M3U_CT) or (b"EXTM3U" in buf) or (b".m3u8" in buf):
+                        if _LOG_INFO:
+                            logging.info("Path bulundu: %s (via %s)", f"{scheme}{host}/", url)
+                        return f"{scheme}{host}/"
+                    if ACCEPT_BARE_200 and status == 200:
+                        if _LOG_INFO:
+                            logging.info("200 geldi, path muhtemelen var: %s (via %s) ct=%s", f"{scheme}{host}/", url, ct)
+                        return f"{scheme}{host}/"
             return None
 
-        tasks = [asyncio.create_task(_check_host(h)) for h in candidates]
-        for coro in asyncio.as_completed(tasks):
-            try:
-                res = await coro
-                if isinstance(res, str) and res:
-                    for t in tasks:
-                        if not t.done():
-                            t.cancel()
-                    logging.info("discover_by_path: çalışan host bulundu -> %s", res)
-                    return res
-            except asyncio.CancelledError:
-                pass
-            except Exception:
-                continue
+        # Candidate başına task açmak yerine sabit boyutlu worker havuzu:
+        # 2000 coroutine yerine en fazla CONCURRENCY canlı task olur ve ilk
+        # başarıda yeni iş hiç başlamaz.
+        queue: asyncio.Queue = asyncio.Queue()
+        for h in candidates:
+            queue.put_nowait(h)
+        done = asyncio.Event()
+        result: List[Optional[str]] = [None]
+
+        async def _worker():
+            while not done.is_set():
+                try:
+                    host = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    # Controller'dan geçerek çalış: limit düşerse havuzun
+                    # bir kısmı beklemede kalır, baskı gerçekten uygulanır.
+                    async with self.semaphore:
+                        res = await _check_host(host)
+                except Exception:
+                    res = None
+                if res:
+                    self.negative.pop(host, None)
+                    self.negative.pop(f"{host}|{path}", None)
+                    if not done.is_set():
+                        result[0] = res
+                        done.set()
+                    return
+                # Sadece bu path denendi; host'u komple karalamak yerine
+                # path'e özel anahtar yaz.
+                self.negative[f"{host}|{path}"] = time.time()
+
+        n_workers = min(CONCURRENCY, len(candidates)) or 1
+        workers = [asyncio.create_task(_worker()) for _ in range(n_workers)]
+        pool = asyncio.gather(*workers, return_exceptions=True)
+        stop = asyncio.create_task(done.wait())
+        await asyncio.wait({asyncio.ensure_future(pool), stop}, return_when=asyncio.FIRST_COMPLETED)
+        for w in workers:
+            if not w.done():
+                w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        stop.cancel()
+
+        _save_negative(self.negative)
+
+        if result[0]:
+            logging.info("discover_by_path: çalışan host bulundu -> %s", result[0])
+            return result[0]
 
         logging.info("discover_by_path: hiçbir host path'i sunmadı.")
         return None
 
     # ----- fallback wide discovery (keeps previous behavior) -----
     async def validate_hosts_concurrent(self, hosts: List[str]) -> Optional[str]:
-        async with AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-            async def _check(h):
-                async with self.semaphore:
-                    try:
-                        return await self.validate_host(client, h)
-                    except Exception:
-                        return None
+        client = self._get_client()
+        found = asyncio.Event()
+        result: List[Optional[str]] = [None]
 
-            tasks = [asyncio.create_task(_check(h)) for h in hosts]
-            for coro in asyncio.as_completed(tasks):
-                res = await coro
-                if isinstance(res, str) and res:
-                    for t in tasks:
-                        if not t.done():
-                            t.cancel()
-                    return res
-        return None
+        async def _check(h):
+            if found.is_set():
+                return
+            async with self.semaphore:
+                if found.is_set():
+                    return
+                try:
+                    res = await self.validate_host(client, h)
+                except Exception:
+                    await self.semaphore.record_error()
+                    return
+                if res:
+                    await self.semaphore.record_success()
+                    if not found.is_set():
+                        result[0] = res
+                        found.set()
+                        # TaskGroup kalan task'ları deterministik şekilde iptal eder
+                        raise _StopDiscovery
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for h in hosts:
+                    tg.create_task(_check(h))
+        except* _StopDiscovery:
+            pass
+        return result[0]
 
     async def discover_base(self) -> str:
         cache = _load_cache()
         now_ts = time.time()
+        self.negative = _load_negative()
         if cache.get("base_stream_url") and now_ts - cache.get("base_ts", 0) < CACHE_TTL_SECONDS:
             logging.info("Cache'den base alındı: %s", cache["base_stream_url"])
             return cache["base_stream_url"]
 
-        candidates = set()
-        manual = load_manual_domains()
-        candidates.update(manual)
+        # TTL dolmuş olsa bile son bilinen base hâlâ ayaktaysa tek RTT'lik
+        # sağlık kontrolüyle tüm enumeration'ı atla.
+        prev = cache.get("base_stream_url")
+        if prev:
+            prev_host = re.sub(r"^https?://", "", prev).strip("/").split("/")[0]
+            try:
+                alive = await self.validate_host(self._get_client(), prev_host)
+            except Exception:
+                alive = None
+            if alive:
+                cache.update({"base_stream_url": alive, "base_ts": now_ts})
+                _save_cache(cache)
+                logging.info("Önceki base hâlâ canlı, discovery atlandı: %s", alive)
+                return alive
 
-        try:
-            crt = await self.query_crtsh("zirvedesin")
-            candidates.update(crt)
-        except Exception as e:
-            logging.info("crt.sh sorgu hatası: %s", e)
+        seen = _bloom_or_set()
+        candidates = []
 
-        try:
-            cs = await self.query_certspotter("zirvedesin.sbs")
-            candidates.update(cs)
-        except Exception as e:
-            logging.info("certspotter hata: %s", e)
+        def _ingest(items):
+            for h in items:
+                if h not in seen:
+                    seen.add(h)
+                    candidates.append(h)
 
-        try:
-            rpd = await self.query_rapiddns_search("zirvedesin")
-            candidates.update(rpd)
-        except Exception as e:
-            logging.info("rapiddns hata: %s", e)
+        _ingest(load_manual_domains())
 
-        try:
-            dpg = await self.extract_from_dengetv_pages(start=DENGETV_START, end=DENGETV_END, max_pages=DENGETV_MAX_PAGES)
-            candidates.update(dpg)
-        except Exception as e:
-            logging.info("dengetv extract hata: %s", e)
+        # Dört pasif kaynak birbirinden bağımsız; sırayla beklemek yerine
+        # hepsini aynı anda çalıştır (toplam süre = en yavaş kaynak).
+        sources = await asyncio.gather(
+            asyncio.wait_for(self.query_crtsh("zirvedesin"), SOURCE_TIMEOUT),
+            asyncio.wait_for(self.query_certspotter("zirvedesin.sbs"), SOURCE_TIMEOUT),
+            asyncio.wait_for(self.query_rapiddns_search("zirvedesin"), SOURCE_TIMEOUT),
+            # sayfa taraması onlarca istek yapıyor, payı daha geniş
+            asyncio.wait_for(
+                self.extract_from_dengetv_pages(start=DENGETV_START, end=DENGETV_END, max_pages=DENGETV_MAX_PAGES),
+                SOURCE_TIMEOUT * 4,
+            ),
+            return_exceptions=True,
+        )
+        for name, res in zip(("crt.sh", "certspotter", "rapiddns", "dengetv"), sources):
+            if isinstance(res, BaseException):
+                logging.info("%s kaynak hatası: %s", name, res)
+                continue
+            _ingest(res)
 
-        if (not candidates and BRUTE_FORCE_ONLY_IF_EMPTY) or (not BRUTE_FORCE_ONLY_IF_EMPTY and True):
+        if (len(candidates) < MIN_CT_CANDIDATES and BRUTE_FORCE_ONLY_IF_EMPTY) or not BRUTE_FORCE_ONLY_IF_EMPTY:
             bf = self.generate_bruteforce_candidates()
-            candidates.update(bf)
+            _ingest(bf)
 
-        candidates = sorted(set([c.strip().lstrip("*.") for c in candidates if c and isinstance(c, str)]))
+        # Normalizasyon set olarak kalır (O(1) üyelik); listeye ancak
+        # iterasyon noktasında, tek seferde çevrilir.
+        candidates = {_normalize_host(c) for c in candidates if isinstance(c, str) and c}
         logging.info("Toplam candidate sayısı: %d", len(candidates))
+        # Doğrulama sırası önemsiz; O(n log n) sort sadece cache dosyasına yazılırken yapılır
+        candidates = list(candidates)
+        _save_candidates(candidates)
+
+        if candidates:
+            candidates = await self.prefilter_resolvable(candidates)
 
         if candidates:
             valid = await self.validate_hosts_concurrent(candidates)
             if valid:
-                cache.update({"base_stream_url": valid, "base_ts": now_ts, "candidates": candidates})
+                cache.update({"base_stream_url": valid, "base_ts": now_ts})
                 _save_cache(cache)
+                _save_negative(self.negative)
                 logging.info("✅ Bulundu ve cache'lendi: %s", valid)
                 return valid
 
         default = "https://yildiz.zirvedesin25.sbs/"
-        cache.update({"base_stream_url": default, "base_ts": now_ts, "candidates": candidates})
+        cache.update({"base_stream_url": default, "base_ts": now_ts})
         _save_cache(cache)
+        _save_negative(self.negative)
         logging.warning("Hiçbiri çalışmadı, varsayılan kullanılıyor: %s", default)
         return default
 
@@ -449,25 +956,65 @@ class Dengetv54Manager:
             29: "yayinex1.m3u8", 30: "yayinex2.m3u8", 31: "yayinex3.m3u8", 32: "yayinex4.m3u8",
             33: "yayinex5.m3u8", 34: "yayinex6.m3u8", 35: "yayinex7.m3u8", 36: "yayinex8.m3u8"
         }
+        # Görünen kanal adları sabittir; her çalıştırmada regex+title
+        # yerine bir kez burada türetilir.
+        self._channel_pretty = {
+            k: _CHAN_NUM_RE.sub(r' \1', v.replace(".m3u8", "")).title()
+            for k, v in self.channel_files.items()
+        }
         self.base_stream_url = None
         self.dengetv_url = None
         self.auto = AutoDiscovery()
 
     async def find_working_dengetv(self, start=DENGETV_START, end=DENGETV_END):
-        async with AsyncClient(timeout=8) as client:
-            for i in range(start, end+1):
-                url = f"https://dengetv{i}.live/"
+        client = self.auto._get_client()
+
+        async def _try(i):
+            url = f"https://dengetv{i}.live/"
+            async with self.auto.semaphore:
                 try:
-                    r = await client.get(url, headers={"User-Agent": random.choice(USER_AGENTS)}, timeout=6)
+                    r = await client.get(url, timeout=6)
                     if r.status_code == 200 and r.text and "m3u8" in r.text:
-                        logging.info("Dengetv domain bulundu -> %s", url)
                         return url
                 except Exception:
-                    continue
+                    pass
+            return None
+
+        # İlk yanıt veren domain yeter; kalan task'lar iptal edilir
+        # (discover_by_path'teki as_completed kalıbıyla aynı).
+        tasks = [asyncio.create_task(_try(i)) for i in range(start, end+1)]
+        try:
+            for coro in asyncio.as_completed(tasks):
+                res = await coro
+                if res:
+                    logging.info("Dengetv domain bulundu -> %s", res)
+                    return res
+        finally:
+            for t in tasks:
+                if not t.done():
+                    t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
         logging.warning("Dengetv domain bulunamadı, varsayılan kullanılıyor.")
         return "https://dengetv67.live/"
 
+    async def _fetch_xplatin(self) -> Optional[str]:
+        try:
+            client = self.auto._get_client()
+            r = await client.get(
+                "https://raw.githubusercontent.com/smtv62/smtv/refs/heads/main/xplatin.m3u",
+                timeout=10,
+            )
+            if r.status_code == 200 and r.text:
+                return r.text.strip()
+            logging.warning("xplatin.m3u indirilemedi, HTTP: %s", getattr(r, "status_code", None))
+        except Exception as e:
+            logging.warning("xplatin.m3u indirme hatası: %s", e)
+        return None
+
     async def calistir(self):
+        # xplatin indirmesi discovery'den bağımsız; onu beklemeden başlat
+        xplatin_task = asyncio.create_task(self._fetch_xplatin())
+
         # 1) Önce path-temelli discovery deneyelim (en etkili)
         try:
             found = await self.auto.discover_by_path("/yayinzirve.m3u8", max_candidates=2000)
@@ -490,38 +1037,42 @@ class Dengetv54Manager:
             f"# Source dengetv: {self.dengetv_url}"
         ]
 
-        for _, file_name in self.channel_files.items():
-            channel_name = re.sub(r'(\d+)', r' \\1', file_name.replace(".m3u8", "")).title()
-            m3u.append(f'#EXTINF:-1 group-title="Dengetv54",{channel_name}')
-            m3u.append('#EXTVLCOPT:http-user-agent=Mozilla/5.0')
-            m3u.append(f'#EXTVLCOPT:http-referrer={self.dengetv_url}')
-            m3u.append(f'{self.base_stream_url}{file_name}')
+        m3u.append("\n".join(
+            _CHANNEL_TPL.format(name=self._channel_pretty[k], ref=self.dengetv_url,
+                                base=self.base_stream_url, file=f)
+            for k, f in self.channel_files.items()
+        ))
 
-        # xplatin.m3u ekle
-        try:
-            async with AsyncClient(timeout=10) as client:
-                r = await client.get("https://raw.githubusercontent.com/smtv62/smtv/refs/heads/main/xplatin.m3u")
-                if r.status_code == 200 and r.text:
-                    m3u.append("\n# --- Xplatin M3U Başlangıcı ---")
-                    m3u.append(r.text.strip())
-                    m3u.append("# --- Xplatin M3U Sonu ---\n")
-                else:
-                    logging.warning("xplatin.m3u indirilemedi, HTTP: %s", getattr(r, "status_code", None))
-        except Exception as e:
-            logging.warning("xplatin.m3u indirme hatası: %s", e)
+        # xplatin.m3u ekle (discovery ile paralel indirildi)
+        xplatin = await xplatin_task
+        if xplatin:
+            m3u.append("\n# --- Xplatin M3U Başlangıcı ---")
+            m3u.append(xplatin)
+            m3u.append("# --- Xplatin M3U Sonu ---\n")
 
-        os.makedirs("output", exist_ok=True)
         output_path = "output/dengetv54.m3u"
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(m3u))
+        data = "\n".join(m3u)
+
+        def _write():
+            os.makedirs("output", exist_ok=True)
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(data)
+
+        # Disk I/O event loop'u bloklamasın
+        await asyncio.to_thread(_write)
 
         logging.info("✅ M3U dosyası güncellendi → %s", output_path)
-        return "\n".join(m3u)
+        return data
 
 # --------------- CLI ---------------
 if __name__ == "__main__":
     mgr = Dengetv54Manager()
+
+    async def _main():
+        async with mgr.auto:
+            await mgr.calistir()
+
     try:
-        asyncio.run(mgr.calistir())
+        asyncio.run(_main())
     except KeyboardInterrupt:
         logging.info("Kullanıcı iptal etti.")